@@ -1,13 +1,18 @@
 import asyncio
 import argparse
+import collections
+import concurrent.futures
+import contextlib
+import gc
 import json
 import logging
 import os
+import sys
 import websockets
-from websockets.exceptions import PayloadTooBig
+from websockets.exceptions import ConnectionClosed, ConnectionClosedError
 from lerobot.robots.so101_follower import SO101Follower, SO101FollowerConfig
 
-# Global robot reference (set when a handler connects)
+# Global robot reference shared by all clients (set once the robot is connected)
 GLOBAL_ROBOT = None
 
 # ROS2 support removed (rclpy not required)
@@ -40,6 +45,29 @@ except Exception:
     # Not available; leave variables as None
     pass
 
+# Optional orjson for the websocket hot path; fall back to stdlib json when it is not installed.
+orjson = None
+try:
+    import orjson
+except Exception:
+    orjson = None
+
+if orjson is not None:
+    json_loads = orjson.loads
+    JSONDecodeError = orjson.JSONDecodeError
+
+    json_dumpb = orjson.dumps
+
+    def json_dumps(obj) -> str:
+        return orjson.dumps(obj).decode()
+else:
+    json_loads = json.loads
+    JSONDecodeError = json.JSONDecodeError
+    json_dumps = json.dumps
+
+    def json_dumpb(obj) -> bytes:
+        return json.dumps(obj, separators=(",", ":")).encode()
+
 # Optional aiohttp for local signaling
 web = None
 try:
@@ -47,230 +75,491 @@ try:
 except Exception:
     web = None
 
+# Single worker so serial-bus writes stay ordered while the event loop keeps serving websockets
+ROBOT_EXEC = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix="so101")
+# Guards one-time connection/setup of the shared robot across concurrent clients
+ROBOT_LOCK = asyncio.Lock()
+
+# Per-process message counters (sent actions, ignored frames by reason); logged once per STATS_INTERVAL
+# seconds instead of per message. Ignored frames get no reply.
+STATS: collections.Counter = collections.Counter()
+STATS_INTERVAL = 1.0
+
 # Track peer connections created via localhost signaling so we can clean them up on shutdown
 LOCAL_PEER_CONNS = []
 
 
-def parse_unity_line(line: str) -> dict | None:
-    """Extract JSON object from a line and parse it."""
+def parse_unity_line(line: str | bytes) -> dict | None:
+    """Extract JSON object from a line (text or binary frame) and parse it.
+
+    Returns None for lines without JSON or with malformed JSON, counting each case in STATS.
+    """
+    # Lines without JSON are common (heartbeats); reject them with a plain find instead of a raised ValueError
+    if isinstance(line, (bytes, bytearray)):
+        start = line.find(b"{")
+        if start < 0:
+            STATS["ignored_no_json"] += 1
+            return None
+        # Pure JSON frames are passed through as-is; otherwise hand orjson a zero-copy view of the
+        # JSON tail (stdlib json cannot read a memoryview)
+        if start == 0:
+            raw = line
+        else:
+            raw = memoryview(line)[start:] if orjson is not None else line[start:]
+    else:
+        start = line.find("{")
+        if start < 0:
+            STATS["ignored_no_json"] += 1
+            return None
+        raw = line[start:] if start else line
     try:
-        start = line.index("{")
-        raw = line[start:]
-        return json.loads(raw)
-    except ValueError:
-        return None
-    except json.JSONDecodeError:
-        logging.warning("Failed to decode JSON from line: %s", line)
+        return json_loads(raw)
+    except JSONDecodeError:
+        # Counted rather than warned per frame so a client streaming bad JSON cannot flood the log
+        STATS["ignored_bad_json"] += 1
+        logging.debug("Failed to decode JSON from line: %.200r", line)
         return None
 
 
-def unity_to_so101_action(msg: dict, robot=None) -> dict:
-    """Map incoming Unity 0-180 values to the robot's motor range (in degrees when possible).
+# Motor names used when no robot bus is available to enumerate them.
+DEFAULT_MOTOR_NAMES = (
+    "shoulder_pan",
+    "shoulder_lift",
+    "elbow_flex",
+    "wrist_flex",
+    "wrist_roll",
+    "gripper",
+)
+
+
+# Immutable per-connection mapping: one (motor, action_key, offset, scale) entry per motor.
+CalibTable = tuple[tuple[str, str, float, float], ...]
 
-    If `robot` is provided and has calibration, map 0->motor_min and 180->motor_max (in the robot's
-    normalized units, e.g., degrees when `use_degrees=True`). Otherwise fall back to mapping to
-    [0, 180].
+
+def build_calibration_table(robot=None) -> CalibTable:
+    """Precompute per-motor (motor, action_key, offset, scale) so a Unity value v maps to offset + v * scale.
+
+    For calibrated motors 0 maps to the calibrated minimum and 180 to the maximum, in the robot's
+    normalized units (degrees when `use_degrees=True`). The bus normalization is affine in the raw
+    encoder value, so the range ends are normalized once here instead of on every message. Motors
+    without calibration pass values through unchanged.
     """
-    # Use robot default motor names when available (e.g. those in harp_arm.json). If `robot` is None
-    # fall back to a sensible set.
+    # Use robot motor names when available (e.g. those in harp_arm.json), else a sensible default set.
     if robot is not None and hasattr(robot, "bus"):
         motor_names = list(robot.bus.motors.keys())
     else:
-        motor_names = [
-            "shoulder_pan",
-            "shoulder_lift",
-            "elbow_flex",
-            "wrist_flex",
-            "wrist_roll",
-            "gripper",
-        ]
-
-    action: dict[str, float] = {}
+        motor_names = list(DEFAULT_MOTOR_NAMES)
 
-    # Try to build per-motor normalized mins/maxes if robot calibration is available
-    name_to_min_norm: dict[str, float] = {}
-    name_to_max_norm: dict[str, float] = {}
+    norm_range: dict[str, tuple[float, float]] = {}
     try:
         if robot is not None and hasattr(robot, "bus") and robot.bus.calibration:
-            id_to_min = {robot.bus.motors[motor].id: robot.bus.calibration[motor].range_min for motor in robot.bus.motors}
-            id_to_max = {robot.bus.motors[motor].id: robot.bus.calibration[motor].range_max for motor in robot.bus.motors}
-            id_to_min_norm = robot.bus._normalize(id_to_min)
-            id_to_max_norm = robot.bus._normalize(id_to_max)
-            # convert to motor-name keyed dicts
-            name_to_min_norm = {motor: id_to_min_norm[robot.bus.motors[motor].id] for motor in robot.bus.motors}
-            name_to_max_norm = {motor: id_to_max_norm[robot.bus.motors[motor].id] for motor in robot.bus.motors}
+            bus = robot.bus
+            calibrated = [motor for motor in motor_names if motor in bus.calibration]
+            id_to_min = {bus.motors[motor].id: bus.calibration[motor].range_min for motor in calibrated}
+            id_to_max = {bus.motors[motor].id: bus.calibration[motor].range_max for motor in calibrated}
+            id_to_min_norm = bus._normalize(id_to_min)
+            id_to_max_norm = bus._normalize(id_to_max)
+            for motor in calibrated:
+                mid = bus.motors[motor].id
+                norm_range[motor] = (id_to_min_norm[mid], id_to_max_norm[mid])
     except Exception:
-        logging.exception("Could not compute normalized min/max from calibration; falling back to [-180,180]")
+        logging.exception("Could not compute normalized min/max from calibration; passing values through as degrees")
+        norm_range = {}
 
-    # Map incoming values by centering at the motor's minimum. For calibrated motors
-    # compute raw_target = min + (v/180) * (max - min) where v in [-90, 90]. Do not clamp inputs.
-    ids_to_raw: dict[int, float] = {}
+    table: list[tuple[str, str, float, float]] = []
     for motor in motor_names:
-        if motor not in msg:
-            continue
-        raw_val = msg[motor]
-        try:
-            v = float(raw_val)
-        except (TypeError, ValueError):
-            logging.warning("Invalid numeric value for %s: %r", motor, raw_val)
-            continue
-
-        # If motor has calibration, compute a raw encoder target centered on the minimum
-        if robot is not None and hasattr(robot, "bus") and motor in robot.bus.motors and motor in robot.bus.calibration:
-            motor_id = robot.bus.motors[motor].id
-            cal = robot.bus.calibration[motor]
-            raw_min = cal.range_min
-            raw_max = cal.range_max
-            span = raw_max - raw_min
-            raw_target = raw_min + (v / 180.0) * span
-            ids_to_raw[motor_id] = raw_target
+        if motor in norm_range:
+            norm_min, norm_max = norm_range[motor]
+            table.append((motor, motor + ".pos", norm_min, (norm_max - norm_min) / 180.0))
         else:
             # No calibration: pass through degrees (-90..90 expected by Unity)
-            action[f"{motor}.pos"] = v
+            table.append((motor, motor + ".pos", 0.0, 1.0))
+    return tuple(table)
 
-    # Normalize raw targets through the bus and set action values
-    if ids_to_raw and robot is not None and hasattr(robot, "bus"):
-        try:
-            ids_to_norm = robot.bus._normalize({int(k): int(v) for k, v in ids_to_raw.items()})
-            for motor in motor_names:
-                if motor in robot.bus.motors:
-                    mid = robot.bus.motors[motor].id
-                    if mid in ids_to_norm:
-                        action[f"{motor}.pos"] = ids_to_norm[mid]
-        except Exception:
-            logging.exception("Failed to normalize raw targets; keeping fallback degree values for uncalibrated motors")
 
+# Calibration table for the connected robot (set once the robot is connected)
+CALIB_TABLE: CalibTable = build_calibration_table()
 
-    # Defaults for joints Unity doesn't provide
-    action.setdefault("wrist_roll.pos", 0.0)
-    action.setdefault("gripper.pos", 0.0)
-    return action
 
+def _coerce_float(motor: str, value) -> float | None:
+    """Convert a non-float Unity value (int, numeric string) to float, or warn and return None."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        logging.warning("Invalid numeric value for %s: %r", motor, value)
+        return None
 
 
+def compile_action_mapper(calib_table: CalibTable):
+    """Generate `unity_to_so101_action(msg) -> dict` specialized for a calibration table.
 
+    Maps incoming Unity 0-180 values to the robot's motor range (see `build_calibration_table`). Motor
+    names, action keys, offsets and scales are baked in as constants, so a headset message costs one
+    dict get and one multiply-add per motor with no loop or table lookups. Inputs are not clamped.
+    The generated function fills `action` in place when given a (cleared) dict to reuse.
+    """
+    lines = ["def unity_to_so101_action(msg, action=None):", "    if action is None:", "        action = {}"]
+    for motor, key, offset, scale in calib_table:
+        if offset == 0.0 and scale == 1.0:
+            expr = "v"
+        else:
+            expr = f"{offset!r} + v * {scale!r}"
+        # JSON decoders already hand back floats for Unity's values; only other types take the slow path
+        lines += [
+            f"    v = msg.get({motor!r})",
+            "    if v is not None:",
+            "        if type(v) is not float:",
+            f"            v = _coerce_float({motor!r}, v)",
+            "        if v is not None:",
+            f"            action[{key!r}] = {expr}",
+        ]
+    lines += [
+        # Defaults for joints Unity doesn't provide
+        "    action.setdefault('wrist_roll.pos', 0.0)",
+        "    action.setdefault('gripper.pos', 0.0)",
+        "    return action",
+    ]
+    namespace = {"_coerce_float": _coerce_float}
+    exec("\n".join(lines), namespace)
+    return namespace["unity_to_so101_action"]
 
 
+# Mapper for the connected robot; rebuilt from CALIB_TABLE once the robot is connected
+unity_to_so101_action = compile_action_mapper(CALIB_TABLE)
 
 
+# Websocket server limits: Unity pose frames are a few hundred bytes and SDP goes over HTTP, so a small
+# frame limit and a short incoming queue bound per-client memory.
+WS_MAX_SIZE = 64 * 1024
+WS_MAX_QUEUE = 4
+# Close code websockets sends when an incoming frame exceeds WS_MAX_SIZE
+CLOSE_MESSAGE_TOO_BIG = 1009
 
-async def handler(websocket):
-    print("Unity connected")
+# Per-client reply queue depth; when it is full the oldest pending reply is dropped.
+REPLY_QUEUE_SIZE = 64
+# Most replies coalesced into one frame; a backlog this large is flushed without waiting out the window.
+REPLY_BATCH_MAX = 32
 
-    # Create and connect robot (blocking calls done inside the handler as requested)
-    from pathlib import Path
-
-    harp_path = Path(args.calibration_file)
-    if harp_path.is_file():
-        logging.info("Found %s, using it to configure robot calibration.", harp_path)
-        cfg = SO101FollowerConfig(
-            port=args.port,
-            id=harp_path.stem,
-            calibration_dir=harp_path.parent,
-            use_degrees=True,
-        )
-    else:
-        logging.info("Calibration file %s not found; will create it if requested.", harp_path)
-        cfg = SO101FollowerConfig(port=args.port, id=harp_path.stem, calibration_dir=harp_path.parent, use_degrees=True)
 
-    robot = SO101Follower(cfg)
+def _queue_reply(out_q: asyncio.Queue, reply) -> None:
+    """Hand a reply to the client's sender task without waiting on the socket."""
+    try:
+        out_q.put_nowait(reply)
+    except asyncio.QueueFull:
+        # Shed load: the client is not draining replies fast enough, drop the oldest one
+        try:
+            out_q.get_nowait()
+        except asyncio.QueueEmpty:
+            pass
+        out_q.put_nowait(reply)
 
-    global GLOBAL_ROBOT
+
+async def _sender_loop(websocket, out_q: asyncio.Queue) -> None:
+    """Drain queued replies to the websocket so parsing never waits on a send.
+
+    Replies arriving within `--reply-batch-ms` of each other are coalesced into one newline-delimited
+    frame of at most REPLY_BATCH_MAX replies, so a 90 Hz stream costs a handful of sends instead of one
+    per message. If a full batch is already queued it is sent immediately (cork/uncork style).
+    """
+    window = args.reply_batch_ms / 1000.0
     try:
-        logging.info("Connecting to SO-101 on %s", cfg.port)
-        robot.connect()
-        GLOBAL_ROBOT = robot
-    except Exception:
-        logging.exception("Failed to connect to SO-101")
-        await websocket.send("ERROR: failed to connect robot")
+        while True:
+            replies = [await out_q.get()]
+            if window > 0:
+                if out_q.qsize() < REPLY_BATCH_MAX - 1:
+                    await asyncio.sleep(window)
+                while len(replies) < REPLY_BATCH_MAX and not out_q.empty():
+                    replies.append(out_q.get_nowait())
+            await websocket.send("\n".join(replies))
+    except ConnectionClosed:
+        logging.debug("Websocket closed; stopping reply sender")
+
+
+class LatestActionWriter:
+    """Per-connection 1-deep "latest wins" slot in front of robot.send_action.
+
+    Headsets stream poses faster than the serial bus accepts writes. While a write is in flight a newer
+    action overwrites the pending one instead of queueing behind it, so the arm always tracks the
+    freshest pose and the bus is never overcommitted. Each completed write is acknowledged.
+
+    Actions are built in two reused dicts (double-buffered): one may be in flight on the robot
+    executor while the other holds the pending action, so no dict is allocated per frame.
+    """
+
+    def __init__(self, robot, out_q: asyncio.Queue):
+        self.robot = robot
+        self.out_q = out_q
+        self.pending_action: dict | None = None
+        self.action_event = asyncio.Event()
+        self._buffers = ({}, {})
+        self._in_flight: dict | None = None
+
+    def next_buffer(self) -> dict:
+        """Return a cleared dict for the next action: the pending one if any, else the one not in flight."""
+        buf = self.pending_action
+        if buf is None:
+            buf = self._buffers[1] if self._buffers[0] is self._in_flight else self._buffers[0]
+        buf.clear()
+        return buf
+
+    def submit(self, action: dict) -> None:
+        self.pending_action = action
+        self.action_event.set()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            await self.action_event.wait()
+            self.action_event.clear()
+            action, self.pending_action = self.pending_action, None
+            self._in_flight = action
+            try:
+                sent = await loop.run_in_executor(ROBOT_EXEC, self.robot.send_action, action)
+                STATS["actions_sent"] += 1
+                logging.debug("Sent action: %s -> actual: %s", action, sent)
+                _queue_reply(self.out_q, "ACK")
+            except Exception:
+                logging.exception("Failed to send action to SO-101")
+                _queue_reply(self.out_q, "ERROR: send failed")
+            finally:
+                self._in_flight = None
+
+
+def _handle_webrtc_offer(msg: dict, out_q: asyncio.Queue, writer: LatestActionWriter) -> None:
+    # NOTE: WebRTC signaling is now served on a localhost HTTP endpoint.
+    # Inform client to use the local HTTP signaling endpoint instead of via websocket
+    _queue_reply(out_q, WEBRTC_MOVED_REPLY)
+
+
+def _handle_headset(msg: dict, out_q: asyncio.Queue, writer: LatestActionWriter) -> None:
+    # Only act on headset messages for left arm (adjust if needed)
+    if msg.get("arm") != "left":
+        STATS["ignored_not_matching"] += 1
+        return
+
+    action = unity_to_so101_action(msg, writer.next_buffer())
+    if not action:
+        STATS["ignored_no_action"] += 1
         return
 
+    writer.submit(action)
 
-    # If requested, run interactive calibration now and save to the specified calibration file
-    if args.recalibrate:
-        try:
-            logging.info("Starting interactive calibration (this may ask for user input)...")
-            robot.calibrate()
-            logging.info("Calibration finished and saved to %s", robot.calibration_fpath)
+
+# Dispatch table keyed by the message "type" field; unknown types are ignored.
+MESSAGE_HANDLERS = {
+    "webrtc-offer": _handle_webrtc_offer,
+    "headset": _handle_headset,
+}
+
+# Substring tokens for a pre-parse filter, for text and binary frames. A frame that has a "type" key but
+# does not contain every token for at least one handled type cannot dispatch anywhere (e.g. right-arm
+# headset frames), so it is ignored without decoding. Only quoted values are matched, so the filter does
+# not depend on the sender's JSON spacing. Keep the keys in sync with MESSAGE_HANDLERS.
+_DISPATCH_TOKENS_TEXT = {
+    "webrtc-offer": ('"webrtc-offer"',),
+    "headset": ('"headset"', '"left"'),
+}
+_TYPE_KEY_TEXT = '"type"'
+_HANDLED_TOKENS_TEXT = tuple(_DISPATCH_TOKENS_TEXT.values())
+_TYPE_KEY_BYTES = _TYPE_KEY_TEXT.encode()
+_HANDLED_TOKENS_BYTES = tuple(tuple(token.encode() for token in tokens) for tokens in _HANDLED_TOKENS_TEXT)
+
+
+def _cannot_dispatch(message: str | bytes) -> bool:
+    if isinstance(message, str):
+        type_key, handled = _TYPE_KEY_TEXT, _HANDLED_TOKENS_TEXT
+    else:
+        type_key, handled = _TYPE_KEY_BYTES, _HANDLED_TOKENS_BYTES
+    if type_key not in message:
+        return False
+    for tokens in handled:
+        for token in tokens:
+            if token not in message:
+                break
+        else:
+            return False
+    return True
+
+
+def apply_scheduling() -> None:
+    """Pin to --cpus and switch to SCHED_FIFO if requested, before any worker threads are started.
+
+    Threads created afterwards (e.g. the robot executor) inherit both settings.
+    """
+    if args.cpus:
+        if hasattr(os, "sched_setaffinity"):
             try:
-                await websocket.send("CALIBRATED")
-            except Exception:
-                logging.debug("Could not send CALIBRATED message to client")
+                os.sched_setaffinity(0, set(args.cpus))
+                logging.info("Pinned to CPU(s) %s", sorted(args.cpus))
+            except (TypeError, ValueError):
+                logging.warning("Invalid CPU affinity %r; expected a core number or a list of them", args.cpus)
+            except OSError:
+                logging.exception("Failed to set CPU affinity to %s", args.cpus)
+        else:
+            logging.warning("CPU affinity is not supported on this platform; ignoring --cpus")
+    if args.realtime_priority is not None:
+        if hasattr(os, "sched_setscheduler"):
+            try:
+                os.sched_setscheduler(0, os.SCHED_FIFO, os.sched_param(args.realtime_priority))
+                logging.info("Using SCHED_FIFO priority %d", args.realtime_priority)
+            except PermissionError:
+                logging.warning("SCHED_FIFO needs root or CAP_SYS_NICE; keeping default scheduling")
+            except OSError:
+                logging.exception("Failed to set SCHED_FIFO priority %d", args.realtime_priority)
+        else:
+            logging.warning("SCHED_FIFO is not supported on this platform; ignoring --realtime-priority")
+
+
+def _log_stats(loop) -> None:
+    """Log and reset the message counters, then reschedule on `loop`."""
+    if STATS:
+        counts = ", ".join(f"{name}={count}" for name, count in sorted(STATS.items()))
+        logging.info("Last %.0fs: %s", STATS_INTERVAL, counts)
+        STATS.clear()
+    loop.call_later(STATS_INTERVAL, _log_stats, loop)
+
+
+async def ensure_robot():
+    """Connect and configure the shared SO-101 once; later calls reuse GLOBAL_ROBOT.
+
+    Calibration, the Unity mapping table and the per-motor safety limits are all computed here, once
+    per process. Returns None if connecting failed so the next caller can retry.
+    """
+    global GLOBAL_ROBOT, CALIB_TABLE, unity_to_so101_action
+    async with ROBOT_LOCK:
+        if GLOBAL_ROBOT is not None:
+            return GLOBAL_ROBOT
+
+        from pathlib import Path
+
+        harp_path = Path(args.calibration_file)
+        if harp_path.is_file():
+            logging.info("Found %s, using it to configure robot calibration.", harp_path)
+            cfg = SO101FollowerConfig(
+                port=args.port,
+                id=harp_path.stem,
+                calibration_dir=harp_path.parent,
+                use_degrees=True,
+            )
+        else:
+            logging.info("Calibration file %s not found; will create it if requested.", harp_path)
+            cfg = SO101FollowerConfig(port=args.port, id=harp_path.stem, calibration_dir=harp_path.parent, use_degrees=True)
+
+        robot = SO101Follower(cfg)
+
+        # Blocking bus I/O runs on the robot executor, like every other serial access
+        loop = asyncio.get_running_loop()
+        try:
+            logging.info("Connecting to SO-101 on %s", cfg.port)
+            await loop.run_in_executor(ROBOT_EXEC, robot.connect)
         except Exception:
-            logging.exception("Calibration failed")
+            logging.exception("Failed to connect to SO-101")
+            return None
+
+        # If requested, run interactive calibration now and save to the specified calibration file
+        if args.recalibrate:
             try:
-                await websocket.send("ERROR: calibration failed")
+                logging.info("Starting interactive calibration (this may ask for user input)...")
+                await loop.run_in_executor(ROBOT_EXEC, robot.calibrate)
+                logging.info("Calibration finished and saved to %s", robot.calibration_fpath)
             except Exception:
-                logging.debug("Could not send ERROR message to client")
+                logging.exception("Calibration failed")
 
-    # Configure per-motor max_relative_target to avoid overloads using calibration ranges.
-    # We set a conservative fraction of the normalized per-motor range (5% default).
+        # Precompute the Unity -> motor mapping once (after any recalibration above)
+        CALIB_TABLE = build_calibration_table(robot)
+        unity_to_so101_action = compile_action_mapper(CALIB_TABLE)
+
+        # Configure per-motor max_relative_target to avoid overloads using calibration ranges.
+        # We set a conservative fraction of the normalized per-motor range (5% default).
+        try:
+            FRACTION = 0.05
+            if hasattr(robot, "bus") and robot.bus.calibration:
+                # Build raw maps for mins/maxs keyed by id
+                id_to_min = {robot.bus.motors[motor].id: robot.bus.calibration[motor].range_min for motor in robot.bus.motors}
+                id_to_max = {robot.bus.motors[motor].id: robot.bus.calibration[motor].range_max for motor in robot.bus.motors}
+                norm_min = robot.bus._normalize(id_to_min)
+                norm_max = robot.bus._normalize(id_to_max)
+                max_relative = {}
+                for motor_name, motor_obj in robot.bus.motors.items():
+                    id_ = motor_obj.id
+                    span = abs(norm_max[id_] - norm_min[id_])
+                    # Avoid zero span
+                    cap = max(1e-3, span * FRACTION)
+                    max_relative[motor_name] = cap
+                robot.config.max_relative_target = max_relative
+                logging.info("Set per-motor max_relative_target from calibration: %s", max_relative)
+        except Exception:
+            logging.exception("Failed to compute safety limits from calibration; continuing without per-motor limiter")
+
+        GLOBAL_ROBOT = robot
+        return robot
+
+
+async def disconnect_robot() -> None:
+    """Disconnect the shared SO-101 at process exit."""
+    global GLOBAL_ROBOT
+    robot, GLOBAL_ROBOT = GLOBAL_ROBOT, None
+    if robot is None:
+        return
     try:
-        FRACTION = 0.05
-        if hasattr(robot, "bus") and robot.bus.calibration:
-            # Build raw maps for mins/maxs keyed by id
-            id_to_min = {robot.bus.motors[motor].id: robot.bus.calibration[motor].range_min for motor in robot.bus.motors}
-            id_to_max = {robot.bus.motors[motor].id: robot.bus.calibration[motor].range_max for motor in robot.bus.motors}
-            norm_min = robot.bus._normalize(id_to_min)
-            norm_max = robot.bus._normalize(id_to_max)
-            max_relative = {}
-            for motor_name, motor_obj in robot.bus.motors.items():
-                id_ = motor_obj.id
-                span = abs(norm_max[id_] - norm_min[id_])
-                # Avoid zero span
-                cap = max(1e-3, span * FRACTION)
-                max_relative[motor_name] = cap
-            robot.config.max_relative_target = max_relative
-            logging.info("Set per-motor max_relative_target from calibration: %s", max_relative)
+        # Disconnect on the robot executor so it runs after any write that is still in flight
+        await asyncio.get_running_loop().run_in_executor(ROBOT_EXEC, robot.disconnect)
+        logging.info("Robot disconnected")
     except Exception:
-        logging.exception("Failed to compute safety limits from calibration; continuing without per-motor limiter")
+        logging.exception("Error disconnecting robot")
+
+
+async def handler(websocket):
+    print("Unity connected")
+
+    # All clients share one connected robot; it is only set up on first use or at startup
+    robot = await ensure_robot()
+    if robot is None:
+        await websocket.send("ERROR: failed to connect robot")
+        return
+
+    # Replies go through a per-client queue drained by a dedicated sender task
+    out_q: asyncio.Queue = asyncio.Queue(maxsize=REPLY_QUEUE_SIZE)
+    send_task = asyncio.create_task(_sender_loop(websocket, out_q))
+    # Robot writes run on their own task so the message loop only ever replaces the pending action
+    writer = LatestActionWriter(robot, out_q)
+    writer_task = asyncio.create_task(writer.run())
 
     try:
         async for message in websocket:
 
-            msg = parse_unity_line(message)
-            if msg is None:
-                await websocket.send("IGNORED: no json")
-                continue
-
-            # Only act on headset type messages for left arm (adjust if needed)
-            # NOTE: WebRTC signaling is now served on a localhost HTTP endpoint.
-            if isinstance(msg, dict) and msg.get("type") == "webrtc-offer":
-                # Inform client to use the local HTTP signaling endpoint instead of via websocket
-                await websocket.send(json.dumps({
-                    "type": "webrtc-answer",
-                    "error": "signaling moved to http",
-                    "hint": f"http://{args.webrtc_host}:{args.webrtc_port}/offer"
-                }))
+            if _cannot_dispatch(message):
+                STATS["ignored_not_matching"] += 1
                 continue
 
-            if msg.get("type") != "headset" or msg.get("arm") != "left":
-                await websocket.send("IGNORED: not matching type/arm")
+            msg = parse_unity_line(message)
+            if msg is None:
+                # Already counted in STATS by parse_unity_line (no JSON / bad JSON)
                 continue
 
-            action = unity_to_so101_action(msg, robot)
-            if not action:
-                await websocket.send("IGNORED: no action")
+            # Only string types can dispatch; lists/objects would be unhashable as dict keys
+            msg_type = msg.get("type") if isinstance(msg, dict) else None
+            dispatch = MESSAGE_HANDLERS.get(msg_type) if isinstance(msg_type, str) else None
+            if dispatch is None:
+                STATS["ignored_not_matching"] += 1
                 continue
-
-            try:
-                sent = robot.send_action(action)
-                logging.info("Sent action: %s -> actual: %s", action, sent)
-                await websocket.send("ACK")
-            except Exception:
-                logging.exception("Failed to send action to SO-101")
-                await websocket.send("ERROR: send failed")
-
-    except PayloadTooBig as e:
-        # This happens when an incoming frame exceeds the server's max_size. We try to notify the client and close.
-        logging.warning("Received oversized payload from client: %s", e)
-        try:
-            await websocket.send("ERROR: payload too big")
-        except Exception:
-            logging.debug("Failed to send payload-too-big message to client")
+            dispatch(msg, out_q, writer)
+
+    except ConnectionClosedError as e:
+        # With a finite max_size, websockets fails the connection with close code 1009 when an incoming
+        # frame is too big; the socket is already closed, so no error reply can be sent.
+        close = e.sent or e.rcvd
+        if close is not None and close.code == CLOSE_MESSAGE_TOO_BIG:
+            logging.warning("Closed connection after oversized frame from client (limit %d bytes)", WS_MAX_SIZE)
+        else:
+            logging.warning("Websocket connection closed with error: %s", e)
     except Exception as e:
         logging.exception("Websocket handler error: %s", e)
     finally:
+        for task in (writer_task, send_task):
+            task.cancel()
+            with contextlib.suppress(asyncio.CancelledError, Exception):
+                await task
         # Close any active WebRTC PeerConnections for this websocket
         try:
             if hasattr(websocket, "peer_conns"):
@@ -281,12 +570,6 @@ async def handler(websocket):
                         logging.debug("Error closing PeerConnection")
         except Exception:
             logging.debug("PeerConnection cleanup failed")
-        try:
-            GLOBAL_ROBOT = None
-            robot.disconnect()
-            logging.info("Robot disconnected")
-        except Exception:
-            logging.exception("Error disconnecting robot")
 
 
 # Parse CLI args early so handler can use them
@@ -307,6 +590,9 @@ except Exception:
 DEFAULT_PORT = CONFIG.get("follower_port", os.environ.get("FOLLOWER_PORT", "/dev/ttyACM1"))
 parser.add_argument("--port", default=DEFAULT_PORT, help=f"Serial port for the SO-101 arm (default: {DEFAULT_PORT})")
 
+# Replies sent within this window are coalesced into one newline-delimited frame (0 = one frame per reply)
+parser.add_argument("--reply-batch-ms", type=float, default=float(CONFIG.get("reply_batch_ms", 5.0)), help="Coalesce websocket replies sent within this many milliseconds into one frame; 0 disables (default: 5)")
+
 # WebRTC streaming options
 parser.add_argument("--webrtc", action="store_true", help="Enable WebRTC video streaming for camera previews")
 parser.add_argument("--stream-camera-name", default=None, help="Name of the camera to stream (e.g., 'wrist' or 'opencv:0')")
@@ -314,19 +600,50 @@ parser.add_argument("--webrtc-fps", type=int, default=int(CONFIG.get("webrtc_fps
 parser.add_argument("--webrtc-host", default="127.0.0.1", help="Host for local WebRTC signaling HTTP server (default: 127.0.0.1)")
 parser.add_argument("--webrtc-port", type=int, default=int(CONFIG.get("webrtc_port", 8082)), help="Port for local WebRTC signaling HTTP server (default: 8082)")
 
+# Scheduling options for jitter-sensitive control (Linux only)
+# settings.json may give cpu_affinity as a single core or a list of cores
+_cpu_affinity = CONFIG.get("cpu_affinity")
+if isinstance(_cpu_affinity, int):
+    _cpu_affinity = [_cpu_affinity]
+parser.add_argument("--cpus", type=int, nargs="+", default=_cpu_affinity, help="Pin the bridge to these CPU cores, e.g. an isolcpus= core (default: no pinning)")
+parser.add_argument("--realtime-priority", type=int, default=CONFIG.get("realtime_priority"), help="Run under SCHED_FIFO at this priority (1-99); needs root or CAP_SYS_NICE (default: off)")
+
+# Event loop selection
+parser.add_argument("--no-uvloop", action="store_true", help="Use the default asyncio event loop even if uvloop is installed (debugging)")
+
 # TCP and ROS support removed; this bridge uses WebSockets only.
 args = parser.parse_args()
 
+# Constant signaling replies, encoded once. Answers only JSON-encode the SDP string and splice it in.
+WEBRTC_MOVED_REPLY = json_dumps({
+    "type": "webrtc-answer",
+    "error": "signaling moved to http",
+    "hint": f"http://{args.webrtc_host}:{args.webrtc_port}/offer"
+})
+_ANS_PREFIX = b'{"sdp":'
+_ANS_SUFFIX = b'}'
+_ERR_WEBRTC_DISABLED = b'{"error":"webrtc disabled"}'
+_ERR_AIOHTTP_MISSING = b'{"error":"aiohttp missing"}'
+_ERR_INVALID_JSON = b'{"error":"invalid json"}'
+_ERR_NO_CAMERA = b'{"error":"no camera available"}'
+_ERR_WEBRTC_MISSING = b'{"error":"webrtc dependencies missing"}'
+_ERR_INTERNAL = b'{"error":"internal"}'
+
+
+def _json_body_response(body: bytes, status: int = 200):
+    return web.Response(body=body, status=status, content_type="application/json")
+
+
 # Local HTTP signaling server for WebRTC (hosted on localhost by default).
 async def _webrtc_offer(request):
     if not args.webrtc:
-        return web.json_response({"error": "webrtc disabled"}, status=403)
+        return _json_body_response(_ERR_WEBRTC_DISABLED, status=403)
     if web is None:
-        return web.json_response({"error": "aiohttp missing"}, status=500)
+        return _json_body_response(_ERR_AIOHTTP_MISSING, status=500)
     try:
         data = await request.json()
     except Exception:
-        return web.json_response({"error": "invalid json"}, status=400)
+        return _json_body_response(_ERR_INVALID_JSON, status=400)
     sdp = data.get("sdp")
     cam_name = data.get("camera") or args.stream_camera_name or CONFIG.get("camera_name")
     cam = None
@@ -344,9 +661,9 @@ async def _webrtc_offer(request):
         cam_name = f"opencv:{cam_idx}"
 
     if cam is None:
-        return web.json_response({"error":"no camera available"}, status=404)
+        return _json_body_response(_ERR_NO_CAMERA, status=404)
     if RTCPeerConnection is None or CameraVideoTrack is None or av is None:
-        return web.json_response({"error":"webrtc dependencies missing"}, status=500)
+        return _json_body_response(_ERR_WEBRTC_MISSING, status=500)
     try:
         pc = RTCPeerConnection()
         track = CameraVideoTrack(cam, fps=args.webrtc_fps)
@@ -358,10 +675,10 @@ async def _webrtc_offer(request):
         await pc.setLocalDescription(answer)
 
         LOCAL_PEER_CONNS.append(pc)
-        return web.json_response({"sdp": pc.localDescription.sdp})
+        return _json_body_response(_ANS_PREFIX + json_dumpb(pc.localDescription.sdp) + _ANS_SUFFIX)
     except Exception:
         logging.exception("Failed to handle HTTP webrtc offer")
-        return web.json_response({"error":"internal"}, status=500)
+        return _json_body_response(_ERR_INTERNAL, status=500)
 
 async def start_webrtc_http_server():
     if web is None:
@@ -401,6 +718,18 @@ async def stop_webrtc_http_server(runner):
 async def main():
     webrtc_http_runner = None
 
+    loop = asyncio.get_running_loop()
+    loop.call_later(STATS_INTERVAL, _log_stats, loop)
+
+    apply_scheduling()
+
+    # Connect the shared robot up front (and recalibrate if requested); clients retry if this fails
+    await ensure_robot()
+
+    # Move everything allocated during setup out of the collector's view, so collections triggered by
+    # per-frame garbage don't traverse the long-lived robot/calibration objects
+    gc.freeze()
+
     if args.webrtc:
         webrtc_http_runner = await start_webrtc_http_server()
 
@@ -409,16 +738,20 @@ async def main():
             handler,
             "0.0.0.0",
             8081,
-            max_size=None,
+            max_size=WS_MAX_SIZE,  # larger frames fail the connection with close code 1009
+            max_queue=WS_MAX_QUEUE,  # apply backpressure instead of buffering frames without bound
+            compression=None,  # pose frames are tiny; permessage-deflate only costs CPU
             ping_interval=None,  # disable server pings
             ping_timeout=None,   # don't time out on missed pongs (infinite keepalive)
         ):
-            print("WebSocket server running on port 8081 (accepting large frames, infinite keepalive)")
+            print(f"WebSocket server running on port 8081 (max frame {WS_MAX_SIZE} bytes, infinite keepalive)")
             await asyncio.Future()  # keep alive
     finally:
         # Stop HTTP signaling server if started
         if webrtc_http_runner is not None:
             await stop_webrtc_http_server(webrtc_http_runner)
+        await disconnect_robot()
+        ROBOT_EXEC.shutdown(wait=False)
         # Close any local peer connections created via HTTP signaling
         try:
             for pc in LOCAL_PEER_CONNS:
@@ -433,4 +766,18 @@ async def main():
 # TCP and ROS functionality removed — this bridge uses WebSockets for control and (optionally) WebRTC for camera streaming.
 
 
-asyncio.run(main())
\ No newline at end of file
+# Prefer uvloop's libuv-backed event loop when available; it is a drop-in for websockets/aiohttp.
+uvloop = None
+if not args.no_uvloop:
+    try:
+        import uvloop
+    except ImportError:
+        logging.debug("uvloop not installed; using default asyncio event loop")
+
+if uvloop is not None and sys.version_info >= (3, 12):
+    # asyncio.run() takes a loop factory from 3.12 on, where uvloop.install() is deprecated
+    asyncio.run(main(), loop_factory=uvloop.new_event_loop)
+else:
+    if uvloop is not None:
+        uvloop.install()
+    asyncio.run(main())